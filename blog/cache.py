@@ -0,0 +1,35 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+
+POST_LIST_CACHE_PREFIX = "post-list"
+POST_LIST_CACHE_TIMEOUT = 30
+COMMENT_LIST_CACHE_TIMEOUT = 10
+# Version keys outlive every page cached under them; an expired version only causes a miss
+CACHE_VERSION_TIMEOUT = max(POST_LIST_CACHE_TIMEOUT, COMMENT_LIST_CACHE_TIMEOUT)
+
+
+def comment_list_cache_prefix(post_id):
+    """Return the cache prefix for the comment pages of a post."""
+    return f"post-comments:{int(post_id)}"
+
+
+def get_cache_key(prefix, request, create=False):
+    """Build a cache key for the request URL under the current version of a prefix.
+
+    Returns None when the prefix has no version yet, unless create is set, so that
+    reads never write to the cache.
+    """
+    version_key = f"{prefix}:version"
+    if create:
+        version = cache.get_or_set(version_key, uuid4().hex, CACHE_VERSION_TIMEOUT)
+    else:
+        version = cache.get(version_key)
+        if version is None:
+            return None
+    return f"{prefix}:{version}:{request.build_absolute_uri()}"
+
+
+def invalidate(prefix):
+    """Invalidate every key under a prefix by moving it to a new version."""
+    cache.set(f"{prefix}:version", uuid4().hex, CACHE_VERSION_TIMEOUT)
@@ -0,0 +1,17 @@
+# Generated by Django 6.1.2 on 2026-10-15 01:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-created_at'], name='post_created_desc_idx'),
+        ),
+    ]
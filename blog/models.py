@@ -12,6 +12,7 @@ class Post(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at"], name="post_created_desc_idx")]
 
     def __str__(self):
         return self.title
@@ -20,7 +21,8 @@ class Post(models.Model):
 class Comment(models.Model):
     """Comment model for blog posts."""
 
-    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="comments")
+    # Lookups by post are served by comment_post_created_idx, whose leading column is post_id.
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="comments", db_index=False)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -28,6 +30,7 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [models.Index(fields=["post", "created_at"], name="comment_post_created_idx")]
 
     def __str__(self):
         return f"Comment by {self.author} on {self.post.title}"
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class PostCursorPagination(CursorPagination):
+    """Keyset pagination for posts, newest first."""
+
+    page_size = 10
+    ordering = "-created_at"
+
+
+class CommentCursorPagination(CursorPagination):
+    """Keyset pagination for a post's comments, oldest first."""
+
+    page_size = 10
+    ordering = "created_at"
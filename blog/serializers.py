@@ -15,9 +15,12 @@ class PostSerializer(serializers.ModelSerializer):
 class PostListSerializer(serializers.ModelSerializer):
     """Serializer for listing posts (without full content)."""
 
+    summary = serializers.CharField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = Post
-        fields = ["id", "title", "content", "author"]
+        fields = ["id", "title", "summary", "author", "comment_count"]
 
 
 class CommentSerializer(serializers.ModelSerializer):
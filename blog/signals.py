@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import POST_LIST_CACHE_PREFIX, comment_list_cache_prefix, invalidate
+from .models import Comment, Post
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_caches(sender, instance, **kwargs):
+    """Drop cached post list pages and the post's comment pages."""
+    invalidate(POST_LIST_CACHE_PREFIX)
+    invalidate(comment_list_cache_prefix(instance.pk))
+
+
+@receiver(post_save, sender=Comment)
+def invalidate_comment_caches(sender, instance, **kwargs):
+    """Drop cached comment pages of the comment's post and the post list comment counts.
+
+    Comment deletes are not hooked here: a post_delete receiver would stop Django from
+    deleting comments with a single DELETE, so the view invalidates after deleting.
+    """
+    invalidate(comment_list_cache_prefix(instance.post_id))
+    invalidate(POST_LIST_CACHE_PREFIX)
@@ -1,9 +1,16 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.db.models import QuerySet
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APITransactionTestCase
 
+from .cache import comment_list_cache_prefix
 from .models import Comment, Post
+from .serializers import PostSerializer
 
 
 class PostAPITestCase(APITestCase):
@@ -58,8 +65,10 @@ class PostAPITestCase(APITestCase):
         # Check that list serializer is used (no created_at/updated_at in list view)
         self.assertIn("id", response.data["results"][0])
         self.assertIn("title", response.data["results"][0])
-        self.assertIn("content", response.data["results"][0])
+        self.assertIn("summary", response.data["results"][0])
         self.assertIn("author", response.data["results"][0])
+        # List serializer should not include the full content
+        self.assertNotIn("content", response.data["results"][0])
         # List serializer should not include created_at/updated_at
         self.assertNotIn("created_at", response.data["results"][0])
         self.assertNotIn("updated_at", response.data["results"][0])
@@ -67,21 +76,60 @@ class PostAPITestCase(APITestCase):
     def test_list_posts_pagination(self):
         """Test that post listing supports pagination."""
         # Create more than PAGE_SIZE posts (PAGE_SIZE is 10)
-        for i in range(15):
-            Post.objects.create(
-                title=f"Post {i}",
-                content=f"Content {i}",
-                author=f"Author {i}",
-            )
+        Post.objects.bulk_create(
+            [Post(title=f"Post {i}", content=f"Content {i}", author=f"Author {i}") for i in range(15)],
+        )
 
         url = reverse("post-list")
         response = self.client.get(url, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("results", response.data)
-        self.assertIn("count", response.data)
         self.assertIn("next", response.data)
+        self.assertIn("previous", response.data)
+        self.assertNotIn("count", response.data)  # Cursor pagination skips COUNT(*)
         self.assertEqual(len(response.data["results"]), 10)  # PAGE_SIZE
-        self.assertEqual(response.data["count"], 16)  # 15 new + 1 from setUp
+        self.assertIsNone(response.data["previous"])
+
+        # Follow the cursor to the remaining posts (15 new + 1 from setUp)
+        response = self.client.get(response.data["next"], format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertIsNone(response.data["next"])
+
+    def test_list_posts_summary_truncated(self):
+        """Test that the post list returns a truncated summary of the content."""
+        Post.objects.create(title="Long Post", content="x" * 500, author="Jane Doe")
+
+        url = reverse("post-list")
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["summary"], "x" * 200)
+
+    def test_list_posts_comment_count(self):
+        """Test that the post list includes the number of comments on each post."""
+        Comment.objects.bulk_create(
+            [Comment(post=self.post, content=f"Comment {i}", author=f"Author {i}") for i in range(3)],
+        )
+        uncommented_post = Post.objects.create(title="Quiet Post", content="Content", author="Jane Doe")
+
+        url = reverse("post-list")
+        with self.assertNumQueries(1):
+            response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = {post["id"]: post["comment_count"] for post in response.data["results"]}
+        self.assertEqual(counts, {self.post.pk: 3, uncommented_post.pk: 0})
+
+    def test_list_posts_cached(self):
+        """Test that repeated post listings are served from the cache until a post changes."""
+        url = reverse("post-list")
+        self.client.get(url, format="json")
+        with self.assertNumQueries(0):
+            response = self.client.get(url, format="json")
+        self.assertEqual(len(response.data["results"]), 1)
+
+        Post.objects.create(title="Second Post", content="Content 2", author="Jane Doe")
+        response = self.client.get(url, format="json")
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_get_post_detail(self):
         """Test retrieving a specific post via GET /api/posts/{id}/."""
@@ -95,6 +143,53 @@ class PostAPITestCase(APITestCase):
         self.assertIn("created_at", response.data)
         self.assertIn("updated_at", response.data)
 
+    def test_get_post_detail_matches_serializer(self):
+        """Test that the non-streamed post detail has the same representation as PostSerializer."""
+        url = reverse("post-detail", kwargs={"pk": self.post.pk})
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.json(), PostSerializer(self.post).data)
+
+    def test_get_post_detail_large_content_streamed(self):
+        """Test that a post with large content is streamed with the same fields as a regular detail."""
+        content = 'Line with "quotes" and unicode \u00e9\n' * 1000
+        post = Post.objects.create(title="Long Post", content=content, author="Jane Doe")
+
+        url = reverse("post-detail", kwargs={"pk": post.pk})
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["id"], post.id)
+        self.assertEqual(data["title"], post.title)
+        self.assertEqual(data["content"], content)
+        self.assertEqual(data["author"], post.author)
+        self.assertIn("created_at", data)
+        self.assertIn("updated_at", data)
+
+    def test_get_post_detail_threshold_counts_bytes(self):
+        """Test that the streaming threshold is measured in encoded bytes, not characters."""
+        content = "\u00e9" * 9000  # 9000 characters, 18000 bytes of UTF-8
+        post = Post.objects.create(title="Accented Post", content=content, author="Jane Doe")
+
+        url = reverse("post-detail", kwargs={"pk": post.pk})
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(json.loads(b"".join(response.streaming_content))["content"], content)
+
+    def test_get_post_detail_at_threshold_not_streamed(self):
+        """Test that content of exactly the threshold size in bytes is not streamed."""
+        content = "\u00e9" * 8192  # 16384 bytes of UTF-8
+        post = Post.objects.create(title="Accented Post", content=content, author="Jane Doe")
+
+        url = reverse("post-detail", kwargs={"pk": post.pk})
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.json()["content"], content)
+
     def test_get_post_detail_not_found(self):
         """Test retrieving a non-existent post returns 404."""
         url = reverse("post-detail", kwargs={"pk": 99999})
@@ -136,6 +231,15 @@ class PostAPITestCase(APITestCase):
         self.assertEqual(Post.objects.count(), 0)
         self.assertFalse(Post.objects.filter(pk=self.post.pk).exists())
 
+    def test_delete_post_invalidates_comment_cache(self):
+        """Test that deleting a post stops its cached comment pages from being served."""
+        url = reverse("post-comments", kwargs={"pk": self.post.pk})
+        self.client.get(url, format="json")
+
+        self.client.delete(reverse("post-detail", kwargs={"pk": self.post.pk}), format="json")
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_delete_post_not_found(self):
         """Test deleting a non-existent post returns 404."""
         url = reverse("post-detail", kwargs={"pk": 99999})
@@ -181,7 +285,8 @@ class CommentAPITestCase(APITestCase):
         """Test creating a comment with missing required fields."""
         url = reverse("post-comments", kwargs={"pk": self.post.pk})
         data = {"content": "Incomplete comment"}
-        response = self.client.post(url, data, format="json")
+        with self.assertNumQueries(0):
+            response = self.client.post(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("author", response.data)
 
@@ -192,24 +297,100 @@ class CommentAPITestCase(APITestCase):
         response = self.client.post(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_list_comments_post_not_found_not_cached(self):
+        """Test that listing comments of a non-existent post writes nothing to the cache."""
+        url = reverse("post-comments", kwargs={"pk": 99999})
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIsNone(cache.get(f"{comment_list_cache_prefix(99999)}:version"))
+
     def test_list_comments(self):
         """Test listing comments for a post via GET /api/posts/{id}/comments/."""
         # Create additional comments
-        Comment.objects.create(post=self.post, content="Second comment", author="Bob Smith")
-        Comment.objects.create(post=self.post, content="Third comment", author="Alice Johnson")
-
-        # Create a comment for a different post (should not appear)
         other_post = Post.objects.create(title="Other Post", content="Other content", author="Other Author")
-        Comment.objects.create(post=other_post, content="Other post comment", author="Someone")
+        Comment.objects.bulk_create(
+            [
+                Comment(post=self.post, content="Second comment", author="Bob Smith"),
+                Comment(post=self.post, content="Third comment", author="Alice Johnson"),
+                # A comment for a different post (should not appear)
+                Comment(post=other_post, content="Other post comment", author="Someone"),
+            ],
+        )
 
         url = reverse("post-comments", kwargs={"pk": self.post.pk})
         response = self.client.get(url, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)  # Only comments for self.post
+        self.assertEqual(len(response.data["results"]), 3)  # Only comments for self.post
         # Verify all comments belong to the correct post
-        for comment_data in response.data:
-            comment = Comment.objects.get(pk=comment_data["id"])
-            self.assertEqual(comment.post, self.post)
+        comment_ids = [comment_data["id"] for comment_data in response.data["results"]]
+        post_ids = Comment.objects.filter(pk__in=comment_ids).values_list("post_id", flat=True)
+        self.assertEqual(set(post_ids), {self.post.pk})
+
+    def test_list_comments_matches_detail(self):
+        """Test that listed comments have the same representation as the comment detail."""
+        list_url = reverse("post-comments", kwargs={"pk": self.post.pk})
+        detail_url = reverse(
+            "post-comment-detail",
+            kwargs={"pk": self.post.pk, "comment_id": self.comment.pk},
+        )
+        list_response = self.client.get(list_url, format="json")
+        detail_response = self.client.get(detail_url, format="json")
+        self.assertEqual(list_response.json()["results"], [detail_response.json()])
+
+    def test_list_comments_pagination(self):
+        """Test that comment listing supports cursor pagination."""
+        # Create more than page_size comments (page_size is 10)
+        Comment.objects.bulk_create(
+            [Comment(post=self.post, content=f"Comment {i}", author=f"Author {i}") for i in range(11)],
+        )
+
+        url = reverse("post-comments", kwargs={"pk": self.post.pk})
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(response.data["results"][0]["id"], self.comment.pk)  # Oldest first
+
+        # Follow the cursor to the remaining comments (11 new + 1 from setUp)
+        response = self.client.get(response.data["next"], format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNone(response.data["next"])
+
+    def test_list_comments_cached(self):
+        """Test that repeated comment listings are served from the cache until a comment changes."""
+        url = reverse("post-comments", kwargs={"pk": self.post.pk})
+        self.client.get(url, format="json")
+        with self.assertNumQueries(0):
+            response = self.client.get(url, format="json")
+        self.assertEqual(len(response.data["results"]), 1)
+
+        Comment.objects.create(post=self.post, content="Second comment", author="Bob Smith")
+        response = self.client.get(url, format="json")
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_list_comments_cache_invalidated_for_padded_id(self):
+        """Test that comment pages requested with a zero-padded post id are invalidated too."""
+        url = f"/api/posts/{self.post.pk:04d}/comments/"
+        self.client.get(url, format="json")
+
+        Comment.objects.create(post=self.post, content="Second comment", author="Bob Smith")
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_list_comments_cache_invalidated_on_delete(self):
+        """Test that deleting a comment drops the cached comment list of its post."""
+        url = reverse("post-comments", kwargs={"pk": self.post.pk})
+        self.client.get(url, format="json")
+
+        detail_url = reverse(
+            "post-comment-detail",
+            kwargs={"pk": self.post.pk, "comment_id": self.comment.pk},
+        )
+        self.client.delete(detail_url, format="json")
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.data["results"], [])
 
     def test_list_comments_empty(self):
         """Test listing comments for a post with no comments."""
@@ -217,8 +398,8 @@ class CommentAPITestCase(APITestCase):
         url = reverse("post-comments", kwargs={"pk": new_post.pk})
         response = self.client.get(url, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
-        self.assertEqual(response.data, [])
+        self.assertEqual(len(response.data["results"]), 0)
+        self.assertEqual(response.data["results"], [])
 
     def test_get_comment_detail(self):
         """Test retrieving a specific comment via GET /api/posts/{id}/comments/{id}/."""
@@ -233,6 +414,16 @@ class CommentAPITestCase(APITestCase):
         self.assertEqual(response.data["author"], self.comment.author)
         self.assertIn("created_at", response.data)
 
+    def test_get_comment_detail_single_query(self):
+        """Test that comment detail is served by a single query without loading the post."""
+        url = reverse(
+            "post-comment-detail",
+            kwargs={"pk": self.post.pk, "comment_id": self.comment.pk},
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_get_comment_detail_not_found(self):
         """Test retrieving a non-existent comment returns 404."""
         url = reverse(
@@ -258,7 +449,8 @@ class CommentAPITestCase(APITestCase):
             "post-comment-detail",
             kwargs={"pk": self.post.pk, "comment_id": self.comment.pk},
         )
-        response = self.client.delete(url, format="json")
+        with self.assertNumQueries(1):
+            response = self.client.delete(url, format="json")
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Comment.objects.count(), 0)
         self.assertFalse(Comment.objects.filter(pk=self.comment.pk).exists())
@@ -281,3 +473,19 @@ class CommentAPITestCase(APITestCase):
         )
         response = self.client.delete(url, format="json")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CommentCreateRaceTestCase(APITransactionTestCase):
+    """Test cases for comment creation racing with post deletion."""
+
+    def test_create_comment_post_deleted_after_check(self):
+        """Test that a post deleted between the existence check and the insert returns 404."""
+        post = Post.objects.create(title="Test Post", content="Test content", author="John Doe")
+        url = reverse("post-comments", kwargs={"pk": post.pk})
+        post.delete()
+
+        data = {"content": "Comment", "author": "Author"}
+        with mock.patch.object(QuerySet, "exists", return_value=True):
+            response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Comment.objects.count(), 0)
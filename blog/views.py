@@ -1,11 +1,56 @@
-from django.shortcuts import get_object_or_404
+import orjson
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Left
+from django.http import Http404, StreamingHttpResponse
+from drf_orjson_renderer.renderers import ORJSONRenderer
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
+from .cache import (
+    COMMENT_LIST_CACHE_TIMEOUT,
+    POST_LIST_CACHE_PREFIX,
+    POST_LIST_CACHE_TIMEOUT,
+    comment_list_cache_prefix,
+    get_cache_key,
+    invalidate,
+)
 from .models import Comment, Post
+from .pagination import CommentCursorPagination, PostCursorPagination
 from .serializers import CommentSerializer, PostListSerializer, PostSerializer
 
+STREAMING_CONTENT_THRESHOLD = 16 * 1024  # bytes of UTF-8 encoded content
+STREAMING_CHUNK_SIZE = 8192
+
+
+def exceeds_utf8_size(text, limit):
+    """Return whether text encodes to more than limit bytes of UTF-8, without encoding it whole."""
+    # Every character takes between one and four bytes
+    if len(text) > limit:
+        return True
+    if len(text) * 4 <= limit:
+        return False
+    size = 0
+    for start in range(0, len(text), STREAMING_CHUNK_SIZE):
+        size += len(text[start : start + STREAMING_CHUNK_SIZE].encode())
+        if size > limit:
+            return True
+    return False
+
+
+def stream_post_json(post):
+    """Yield a post as JSON, encoding its content in chunks instead of one large body."""
+    content = post.pop("content")
+    head = orjson.dumps(post, option=ORJSONRenderer.options)
+    yield head[:-1] + b',"content":"'
+    # JSON escapes each character on its own, so escaped slices concatenate to the escaped whole
+    for start in range(0, len(content), STREAMING_CHUNK_SIZE):
+        yield orjson.dumps(content[start : start + STREAMING_CHUNK_SIZE])[1:-1]
+    yield b'"}'
+
 
 class PostViewSet(viewsets.ModelViewSet):
     """
@@ -15,6 +60,30 @@ class PostViewSet(viewsets.ModelViewSet):
 
     queryset = Post.objects.all()
     serializer_class = PostSerializer
+    lookup_value_regex = r"[0-9]+"
+    pagination_class = PostCursorPagination
+
+    def get_queryset(self):
+        """Trim the selected columns when listing posts or looking up a post for its comments."""
+        if self.action == "list":
+            return Post.objects.only("id", "title", "author", "created_at").annotate(
+                summary=Left("content", 200),
+                # A correlated subquery keeps the outer query a LIMITed index walk; a JOIN with
+                # GROUP BY would aggregate every post's comments before paginating.
+                comment_count=Coalesce(
+                    Subquery(
+                        Comment.objects.filter(post=OuterRef("pk"))
+                        .order_by()
+                        .values("post")
+                        .annotate(count=Count("pk"))
+                        .values("count"),
+                    ),
+                    0,
+                ),
+            )
+        if self.action == "comments":
+            return Post.objects.only("id")
+        return super().get_queryset()
 
     def get_serializer_class(self):
         """Use PostListSerializer for list action, PostSerializer for others."""
@@ -22,31 +91,70 @@ class PostViewSet(viewsets.ModelViewSet):
             return PostListSerializer
         return PostSerializer
 
-    @action(detail=True, methods=["get", "post"], url_path="comments")
+    def retrieve(self, request, *args, **kwargs):
+        """Return a post from a values() row, streaming the JSON body for large content."""
+        post = self.get_queryset().filter(pk=kwargs["pk"]).values(*PostSerializer.Meta.fields).first()
+        if post is None:
+            raise Http404
+        if exceeds_utf8_size(post["content"], STREAMING_CONTENT_THRESHOLD):
+            return StreamingHttpResponse(stream_post_json(post), content_type="application/json")
+        return Response(post)
+
+    def list(self, request, *args, **kwargs):
+        """List posts, serving pages from the cache until a post changes."""
+        cache_key = get_cache_key(POST_LIST_CACHE_PREFIX, request, create=True)
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, POST_LIST_CACHE_TIMEOUT)
+        return Response(data)
+
+    @action(
+        detail=True,
+        methods=["get", "post"],
+        url_path="comments",
+        pagination_class=CommentCursorPagination,
+    )
     def comments(self, request, pk=None):
         """
         List comments for a post or create a new comment.
-        GET /api/posts/{id}/comments/ - List all comments for the post
+        GET /api/posts/{id}/comments/ - List comments for the post (cursor paginated)
         POST /api/posts/{id}/comments/ - Create a new comment
         """
-        post = self.get_object()
-
         if request.method == "GET":
-            comments = post.comments.all()
-            serializer = CommentSerializer(comments, many=True)
-            return Response(serializer.data)
+            cache_prefix = comment_list_cache_prefix(pk)
+            cache_key = get_cache_key(cache_prefix, request)
+            data = cache.get(cache_key) if cache_key else None
+            if data is None:
+                post = self.get_object()
+                # Only write to the cache once the post is known to exist
+                cache_key = get_cache_key(cache_prefix, request, create=True)
+                # Plain dicts skip per-row model and serializer instantiation; the JSON
+                # renderer formats created_at the same way CommentSerializer does.
+                comments = post.comments.values("id", "content", "author", "created_at")
+                data = self.get_paginated_response(self.paginate_queryset(comments)).data
+                cache.set(cache_key, data, COMMENT_LIST_CACHE_TIMEOUT)
+            return Response(data)
 
         if request.method == "POST":
+            # Validate before touching the database so invalid requests cost no queries
             serializer = CommentSerializer(data=request.data)
-            if serializer.is_valid():
-                serializer.save(post=post)
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            serializer.is_valid(raise_exception=True)
+            if not Post.objects.filter(pk=pk).exists():
+                raise Http404
+            try:
+                # The post FK is checked on commit, so a post deleted since the check
+                # above surfaces here as an IntegrityError instead of a 500.
+                with transaction.atomic():
+                    serializer.save(post_id=int(pk))
+            except IntegrityError:
+                raise Http404 from None
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(
         detail=True,
         methods=["get", "delete"],
-        url_path="comments/(?P<comment_id>[^/.]+)",
+        url_path="comments/(?P<comment_id>[0-9]+)",
         url_name="comment-detail",
     )
     def comment_detail(self, request, pk=None, comment_id=None):
@@ -55,13 +163,21 @@ class PostViewSet(viewsets.ModelViewSet):
         GET /api/posts/{id}/comments/{comment_id}/ - Get comment details
         DELETE /api/posts/{id}/comments/{comment_id}/ - Delete comment
         """
-        post = self.get_object()
-        comment = get_object_or_404(Comment, pk=comment_id, post=post)
-
         if request.method == "GET":
+            comment = get_object_or_404(
+                Comment.objects.only("id", "content", "author", "created_at", "post_id"),
+                pk=comment_id,
+                post_id=pk,
+            )
             serializer = CommentSerializer(comment)
             return Response(serializer.data)
 
         if request.method == "DELETE":
-            comment.delete()
+            # A single DELETE scoped to the post; Comment has no delete receivers, so
+            # Django does not fetch the rows first and the cache is invalidated here.
+            deleted, _ = Comment.objects.filter(pk=comment_id, post_id=pk).delete()
+            if not deleted:
+                raise Http404
+            invalidate(comment_list_cache_prefix(pk))
+            invalidate(POST_LIST_CACHE_PREFIX)
             return Response(status=status.HTTP_204_NO_CONTENT)
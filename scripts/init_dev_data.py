@@ -10,6 +10,7 @@ import os
 import sys
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
 
 from blog.models import Comment, Post
 
@@ -137,22 +138,21 @@ def create_dummy_posts():
         },
     ]
 
-    created_posts = []
-    for post_data in posts_data:
-        post, created = Post.objects.get_or_create(
-            title=post_data["title"],
-            defaults={
-                "content": post_data["content"],
-                "author": post_data["author"],
-            },
-        )
-        if created:
-            print(f"Created post: {post.title}")
+    titles = [post_data["title"] for post_data in posts_data]
+    existing_posts = {post.title: post for post in Post.objects.filter(title__in=titles)}
+    new_posts = [Post(**post_data) for post_data in posts_data if post_data["title"] not in existing_posts]
+    # On PostgreSQL and SQLite the INSERT uses RETURNING, so new posts come back with their ids set
+    Post.objects.bulk_create(new_posts, batch_size=100)
+
+    for title in titles:
+        if title in existing_posts:
+            print(f"Post already exists: {title}")
         else:
-            print(f"Post already exists: {post.title}")
-        created_posts.append(post)
+            print(f"Created post: {title}")
 
-    return created_posts
+    # Keep the original order so comments can refer to posts by index
+    posts_by_title = existing_posts | {post.title: post for post in new_posts}
+    return [posts_by_title[title] for title in titles]
 
 
 def create_dummy_comments(posts):
@@ -215,19 +215,21 @@ def create_dummy_comments(posts):
         },
     ]
 
-    created_count = 0
+    existing_comments = set(
+        Comment.objects.filter(post__in=posts).values_list("post_id", "content", "author"),
+    )
+    new_comments = []
     for comment_data in comments_data:
         post = posts[comment_data["post_index"]]
-        comment, created = Comment.objects.get_or_create(
-            post=post,
-            content=comment_data["content"],
-            author=comment_data["author"],
-        )
-        if created:
-            created_count += 1
-            print(f"Created comment by {comment.author} on '{post.title}'")
+        if (post.pk, comment_data["content"], comment_data["author"]) in existing_comments:
+            continue
+        new_comments.append(Comment(post=post, content=comment_data["content"], author=comment_data["author"]))
+    Comment.objects.bulk_create(new_comments, batch_size=100)
+
+    for comment in new_comments:
+        print(f"Created comment by {comment.author} on '{comment.post.title}'")
 
-    return created_count
+    return len(new_comments)
 
 
 def main():
@@ -239,13 +241,14 @@ def main():
     print("\nCreating superuser...")
     create_superuser()
 
-    # Create posts
-    print("\nCreating blog posts...")
-    posts = create_dummy_posts()
+    with transaction.atomic():
+        # Create posts
+        print("\nCreating blog posts...")
+        posts = create_dummy_posts()
 
-    # Create comments
-    print("\nCreating comments...")
-    create_dummy_comments(posts)
+        # Create comments
+        print("\nCreating comments...")
+        create_dummy_comments(posts)
 
     # Summary
     print("\n" + "-" * 50)